@@ -0,0 +1,49 @@
+"""Benchmarks `zentra.serialize` against pickle
+
+Builds a synthetic ZentraReadings object and reports the size and the time to
+serialize and load it with pickle and with `to_bytes`/`from_bytes`.
+
+    python benchmarks/serialize.py [readings]
+
+"""
+
+from zentra.api import ZentraReadings
+from zentra.serialize import to_bytes, from_bytes
+import pickle
+import timeit
+import sys
+
+
+def make_readings(count):
+    def measurement(description, value, units):
+        return {'description': description, 'value': value, 'units': units,
+                'precision': 3, 'error': False}
+
+    readings = ZentraReadings()
+    readings.response = {'device': {'device_info': {'device_sn': '06-00000'},
+                                    'timeseries': [{'configuration': {
+                                        'valid_since': '2019-07-01 00:00:00',
+                                        'sensors': [{'port': port, 'sensor_name': 'TEROS 12'}
+                                                    for port in range(1, 7)],
+                                        'values': [[1561939200 + 300 * i, i, -80] +
+                                                   [[measurement('Water Content', 0.3, ' m³/m³'),
+                                                     measurement('Soil Temperature', 20.0, ' °C'),
+                                                     measurement('Bulk EC', 0.01, ' mS/cm')]] * 6
+                                                   for i in range(count)]}}]}}
+
+    return readings.parse()
+
+
+def run(name, dump, load, number=5):
+    data = dump()
+    dump_time = timeit.timeit(dump, number=number) / number
+    load_time = timeit.timeit(lambda: load(data), number=number) / number
+    print('{:<24}{:>12,d} bytes{:>10.1f} ms dump{:>10.1f} ms load'.format(
+        name, len(data), dump_time * 1000, load_time * 1000))
+
+
+if __name__ == '__main__':
+    readings = make_readings(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
+    run('pickle', lambda: pickle.dumps(readings, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads)
+    run('to_bytes', lambda: to_bytes(readings), from_bytes)
+    run('to_bytes (response)', lambda: to_bytes(readings, include_response=True), from_bytes)
@@ -11,12 +11,52 @@ as python dictionaries with nested pandas dataframes.
 """
 
 from requests import Session, Request
+from zentra.registry import CONFIGURATIONS
 import pandas as pd
 from dfply import *
 import datetime
+import gzip
 import json
 
 
+def read_json_bytes(json_file):
+    """
+    Reads the raw bytes of a local json file.
+
+    Parameters
+    ----------
+    json_file : str
+        The path to a local json file. Files ending in ".gz" are decompressed.
+
+    Returns
+    -------
+    bytes
+        The json document.
+
+    """
+    opener = gzip.open if str(json_file).endswith('.gz') else open
+    with opener(json_file, 'rb') as f:
+        return f.read()
+
+
+def load_json(json_file):
+    """
+    Loads a Zentra API response from a local json file.
+
+    Parameters
+    ----------
+    json_file : str
+        The path to a local json file. Files ending in ".gz" are decompressed.
+
+    Returns
+    -------
+    dict
+        The parsed json response.
+
+    """
+    return json.loads(read_json_bytes(json_file))
+
+
 class ZentraToken:
     """
     A class used to represent an user's access token
@@ -43,7 +83,7 @@ class ZentraToken:
         password : str, optional
             The password
         json_file : str, optional
-            The path to a local json file to parse.
+            The path to a local json file to parse. Files ending in ".gz" are decompressed.
 
         """
         self.request = None
@@ -57,7 +97,7 @@ class ZentraToken:
             self.get(username, password)
 
         elif json_file:
-            self.response = json.load(open(json_file))
+            self.response = load_json(json_file)
             self.parse()
 
         if self.request and not self.token:
@@ -143,6 +183,10 @@ class ZentraSettings:
         a pandas DataFrame providing the locations
     installation_metadata : dict
         a dictionary providing the installation metadata
+    configuration_ids : dict
+        the ids of the measurement_settings, time_settings and locations
+        DataFrames in the configuration registry, which share their data, or
+        None for those restored after being modified
 
     """
 
@@ -161,12 +205,12 @@ class ZentraSettings:
         end_time : int, optional
             Return settings with timestamps ≤ end_time. Specify end_time in UTC seconds.
         json_file : str, optional
-            The path to a local json file to parse.
+            The path to a local json file to parse. Files ending in ".gz" are decompressed.
 
         """
 
         if json_file:
-            self.response = json.load(open(json_file))
+            self.response = load_json(json_file)
             self.parse()
         elif sn and token:
             self.get(sn, token, start_time, end_time)
@@ -182,6 +226,7 @@ class ZentraSettings:
             self.time_settings = None
             self.locations = None
             self.installation_metadata = None
+            self.configuration_ids = None
 
     def get(self, sn, token, start_time=None, end_time=None):
         """
@@ -252,11 +297,12 @@ class ZentraSettings:
         """
         # parse the response
         self.device_info = self.response['device']['device_info']
-        self.measurement_settings = pd.DataFrame(
-            self.response['device']['measurement_settings'])
-        self.time_settings = pd.DataFrame(
-            self.response['device']['time_settings'])
-        self.locations = pd.DataFrame(self.response['device']['locations'])
+        # identical settings blocks share one DataFrame
+        self.configuration_ids = {}
+        for block in ('measurement_settings', 'time_settings', 'locations'):
+            self.configuration_ids[block], frame = CONFIGURATIONS.intern(
+                self.response['device'][block])
+            setattr(self, block, frame)
         self.response['device']['installation_metadata'] = self.response['device']['installation_metadata'][0]
         self.response['device']['installation_metadata']['sensor_elevations'] = \
             pd.DataFrame(self.response['device']['installation_metadata']
@@ -265,6 +311,18 @@ class ZentraSettings:
 
         return self
 
+    def __setstate__(self, state):
+        """
+        Restores a pickled ZentraSettings, sharing its settings blocks through
+        the configuration registry of this process.
+        """
+        self.__dict__.update(state)
+        for block, configuration_id in (state.get('configuration_ids') or {}).items():
+            if configuration_id is not None:
+                self.configuration_ids[block], frame = CONFIGURATIONS.register(
+                    configuration_id, state[block])
+                setattr(self, block, frame)
+
 
 class ZentraStatus:
     """
@@ -302,12 +360,12 @@ class ZentraStatus:
         end_time : int, optional
             Return status with timestamps ≤ end_time. Specify end_time in UTC seconds.
         json_file : str, optional
-            The path to a local json file to parse.
+            The path to a local json file to parse. Files ending in ".gz" are decompressed.
 
         """
 
         if json_file:
-            self.response = json.load(open(json_file))
+            self.response = load_json(json_file)
             self.parse()
         elif sn and token:
             self.get(sn, token, start_time, end_time)
@@ -439,11 +497,11 @@ class ZentraReadings:
         end_mrid : int, optional
             Return readings with mrid ≤ start_mrid.
         json_file : str, optional
-            The path to a local json file to parse.
+            The path to a local json file to parse. Files ending in ".gz" are decompressed.
 
         """
         if json_file:
-            self.response = json.load(open(json_file))
+            self.response = load_json(json_file)
             self.parse()
         elif sn and token:
             self.get(sn, token, start_time, end_time, start_mrid, end_mrid)
@@ -556,7 +614,11 @@ class ZentraTimeseriesRecord:
     valid_since : datetime
         The datetime since this record is valid
     sensors : pd.DataFrame
-        a pandas DataFrame providing the sensor configuration
+        a pandas DataFrame providing the sensor configuration, sharing its data
+        with all records with the same configuration
+    sensors_id : str
+        the id of the sensors DataFrame in the configuration registry, or None
+        if it was restored after being modified
     values : pd.DataFrame
         a pandas DataFrame providing the readings
 
@@ -573,7 +635,8 @@ class ZentraTimeseriesRecord:
 
         """
         self.valid_since = configuration['configuration']['valid_since']
-        self.sensors = pd.DataFrame(configuration['configuration']['sensors'])
+        self.sensors_id, self.sensors = CONFIGURATIONS.intern(
+            configuration['configuration']['sensors'])
 
         # configuration = resp['device']['timeseries'][0]
         vals = pd.DataFrame(configuration['configuration']['values'])
@@ -613,3 +676,12 @@ class ZentraTimeseriesRecord:
                                 ),
                      axis=1).tolist()
         )
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled ZentraTimeseriesRecord, sharing its sensors through
+        the configuration registry of this process.
+        """
+        self.__dict__.update(state)
+        if state.get('sensors_id') is not None:
+            self.sensors_id, self.sensors = CONFIGURATIONS.register(state['sensors_id'], state['sensors'])
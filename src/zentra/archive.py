@@ -0,0 +1,188 @@
+"""Batch replay of archived Zentra API responses
+
+This module reprocesses large archives of json responses, such as those saved
+from `ZentraSettings`, `ZentraStatus` and `ZentraReadings` requests. Archives
+may be given as files, directories or glob patterns, and files may be
+gzip-compressed (".json.gz").
+
+Files are read in a pool of threads and parsed in a pool of processes, with a
+bounded number of files in flight, so archives of any size can be streamed.
+
+"""
+
+from zentra.api import ZentraReadings, read_json_bytes
+from zentra.dataframe import readings_frame, empty_frame
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque
+import pandas as pd
+import functools
+import warnings
+import glob
+import json
+import os
+
+JSON_PATTERNS = ('*.json', '*.json.gz')
+"""The file name patterns of archived json responses within directories."""
+
+
+def find_json_files(paths):
+    """
+    Expands files, directories and glob patterns into a list of json files.
+
+    Parameters
+    ----------
+    paths : str or list
+        Paths to json files, directories to search recursively for `JSON_PATTERNS`,
+        or glob patterns.
+
+    Returns
+    -------
+    list
+        the sorted paths of the json files
+
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = []
+    for path in map(str, paths):
+        if os.path.isdir(path):
+            for pattern in JSON_PATTERNS:
+                files.extend(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        elif any(c in path for c in '*?['):
+            files.extend(glob.glob(path, recursive=True))
+        else:
+            files.append(path)
+
+    return sorted(set(files))
+
+
+def _parse_object(cls, keep_response, data):
+    # build an empty object, then parse the archived response into it
+    parsed = cls()
+    parsed.response = json.loads(data)
+    parsed.parse()
+    if not keep_response:
+        # the raw response would cost as much to send back as to parse
+        parsed.response = None
+    return parsed
+
+
+def _parse_frame(data):
+    return readings_frame([json.loads(data)])
+
+
+def _failed(json_file, error, errors):
+    if errors == 'raise':
+        raise Exception('Could not replay "{}": {}'.format(json_file, error)) from error
+    warnings.warn('Skipped "{}": {}'.format(json_file, error))
+
+
+def _pipeline(files, parse, workers, io_workers, processes, max_pending, errors):
+    if errors not in ('raise', 'skip'):
+        raise Exception('"errors" must be either "raise" or "skip".')
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    max_pending = max_pending or 4 * (workers or os.cpu_count() or 1)
+    files = iter(files)
+    reads = deque()
+    parses = deque()
+
+    with ThreadPoolExecutor(io_workers) as io_pool, executor(workers) as parse_pool:
+        while True:
+            # keep a bounded number of files in flight
+            while len(reads) + len(parses) < max_pending:
+                json_file = next(files, None)
+                if json_file is None:
+                    break
+                reads.append((json_file, io_pool.submit(read_json_bytes, json_file)))
+            if not reads and not parses:
+                return
+            while reads and (reads[0][1].done() or not parses):
+                json_file, read = reads.popleft()
+                try:
+                    data = read.result()
+                except Exception as error:
+                    _failed(json_file, error, errors)
+                    continue
+                parses.append((json_file, parse_pool.submit(parse, data)))
+            if not parses:
+                continue
+            json_file, parsed = parses.popleft()
+            try:
+                parsed = parsed.result()
+            except Exception as error:
+                _failed(json_file, error, errors)
+                continue
+            yield parsed
+
+
+def replay(paths, cls=ZentraReadings, workers=None, io_workers=8, processes=True, max_pending=None,
+           keep_response=False, errors='raise'):
+    """
+    Parses archived json responses in parallel.
+
+    Parameters
+    ----------
+    paths : str or list
+        Paths to json files, directories or glob patterns (see `find_json_files`).
+    cls : type, optional
+        The class to parse responses into, one of `ZentraToken`, `ZentraSettings`,
+        `ZentraStatus` or `ZentraReadings`. Defaults to `ZentraReadings`.
+    workers : int, optional
+        The number of parsing workers. Defaults to the number of CPUs.
+    io_workers : int, optional
+        The number of threads reading files.
+    processes : bool, optional
+        Whether to parse in processes (the default) or in threads.
+    max_pending : int, optional
+        The maximum number of files read or parsed at once. Defaults to four per worker.
+    keep_response : bool, optional
+        Whether to keep the raw json response of each parsed object. Defaults to
+        False, since returning it from the parsing workers is about as costly as
+        parsing it.
+    errors : str, optional
+        Either "raise" (the default), to stop at the first file that cannot be
+        read or parsed, or "skip", to warn and carry on with the other files.
+
+    Yields
+    ------
+    object
+        the parsed objects, in the order of their files
+
+    """
+    yield from _pipeline(find_json_files(paths), functools.partial(_parse_object, cls, keep_response),
+                         workers, io_workers, processes, max_pending, errors)
+
+
+def replay_frame(paths, workers=None, io_workers=8, processes=True, max_pending=None, errors='raise'):
+    """
+    Parses archived readings responses in parallel into one flat dataframe.
+
+    Parameters
+    ----------
+    paths : str or list
+        Paths to json files, directories or glob patterns (see `find_json_files`).
+    workers : int, optional
+        The number of parsing workers. Defaults to the number of CPUs.
+    io_workers : int, optional
+        The number of threads reading files.
+    processes : bool, optional
+        Whether to parse in processes (the default) or in threads.
+    max_pending : int, optional
+        The maximum number of files read or parsed at once. Defaults to four per worker.
+    errors : str, optional
+        Either "raise" (the default), to stop at the first file that cannot be
+        read or parsed, or "skip", to warn and carry on with the other files.
+
+    Returns
+    -------
+    pd.DataFrame
+        a dataframe with one row per measurement (see `zentra.dataframe.DTYPES`)
+
+    """
+    frames = list(_pipeline(find_json_files(paths), _parse_frame,
+                            workers, io_workers, processes, max_pending, errors))
+    if not frames:
+        return empty_frame()
+
+    return pd.concat(frames, ignore_index=True)
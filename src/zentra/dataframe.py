@@ -0,0 +1,128 @@
+"""Partitioned dataframes of Zentra readings
+
+This module builds flat pandas dataframes of readings, and lazily evaluated
+Dask dataframes spanning many devices and long time ranges. Each Dask
+partition covers one device and one time window, and is only requested from
+the Zentra API (or read from a local archive) when it is computed.
+
+Dask is an optional dependency, required only by `read_zentra`.
+
+"""
+
+from zentra.api import ZentraReadings, load_json
+from zentra.export import COLUMNS, iter_rows
+import pandas as pd
+import os
+
+DTYPES = {'sn': object,
+          'datetime': 'datetime64[ns, UTC]',
+          'mrid': 'int64',
+          'rssi': 'int64',
+          'port': object,
+          'description': object,
+          'value': 'float64',
+          'units': object,
+          'precision': 'Int64',
+          'error': 'boolean'}
+"""The dtypes of the `COLUMNS` of a readings dataframe."""
+
+
+def empty_frame():
+    """
+    Builds an empty readings dataframe with the `DTYPES` schema.
+
+    Returns
+    -------
+    pd.DataFrame
+        an empty dataframe with the readings columns
+
+    """
+    return pd.DataFrame({column: pd.Series(dtype=DTYPES[column]) for column in COLUMNS})
+
+
+def readings_frame(responses):
+    """
+    Builds a flat readings dataframe from readings responses.
+
+    Parameters
+    ----------
+    responses : iterable
+        json responses from ZentraReadings API calls
+
+    Returns
+    -------
+    pd.DataFrame
+        a dataframe with one row per measurement and the `DTYPES` schema
+
+    """
+    rows = [row for response in responses for row in iter_rows(response)]
+    if not rows:
+        return empty_frame()
+
+    return pd.DataFrame.from_records(rows, columns=COLUMNS).astype(DTYPES)
+
+
+def _read_partition(sn, token, start_time, end_time, archive):
+    if archive:
+        json_file = archive.format(sn=sn, start_time=start_time, end_time=end_time)
+        if os.path.exists(json_file):
+            return readings_frame([load_json(json_file)])
+        if token is None:
+            raise Exception(
+                'The archived json file "{}" does not exist.'.format(json_file))
+
+    return readings_frame([ZentraReadings().build(sn, token,
+                                                  start_time=start_time,
+                                                  end_time=end_time).make_request().response])
+
+
+def read_zentra(serials, start_time, end_time, token=None, window=86400, archive=None):
+    """
+    Builds a lazily evaluated Dask dataframe of readings from many devices.
+
+    The dataframe has one partition per device and time window. Partitions are
+    read when computed, and its columns and dtypes (`DTYPES`) are known up front.
+
+    Parameters
+    ----------
+    serials : list
+        The serial numbers of the devices
+    start_time : int
+        Return readings with timestamps ≥ start_time. Specify start_time in UTC seconds.
+    end_time : int
+        Return readings with timestamps ≤ end_time. Specify end_time in UTC seconds.
+    token : ZentraToken, optional
+        The user's access token. Required unless every partition is archived.
+    window : int, optional
+        The length of each partition's time window, in seconds. Defaults to one day.
+    archive : str, optional
+        A path template for archived json responses, formatted with `sn`,
+        `start_time` and `end_time` (e.g. "archive/{sn}/{start_time}.json.gz").
+        Partitions with an archived file are read from it instead of the API.
+        Without a token, computing a partition whose file is missing raises an
+        exception.
+
+    Returns
+    -------
+    dask.dataframe.DataFrame
+        a dataframe with one row per measurement
+
+    """
+    try:
+        import dask
+        import dask.dataframe as dd
+    except ImportError:
+        raise ImportError(
+            '"read_zentra" requires dask. Install it with `pip install "dask[dataframe]"`.')
+
+    if token is None and archive is None:
+        raise Exception(
+            'Either "token" or "archive" must be included.')
+
+    read_partition = dask.delayed(_read_partition, pure=True)
+    partitions = [read_partition(sn, token, window_start,
+                                 min(window_start + window - 1, end_time), archive)
+                  for sn in serials
+                  for window_start in range(start_time, end_time + 1, window)]
+
+    return dd.from_delayed(partitions, meta=empty_frame(), verify_meta=False)
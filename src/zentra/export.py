@@ -0,0 +1,173 @@
+"""Streaming export of Zentra readings
+
+This module flattens Zentra readings responses into rows and writes them to
+CSV or newline-delimited JSON (NDJSON) files, optionally gzip-compressed.
+Rows are generated directly from the json responses, one response at a time,
+so memory use does not grow with the number of rows exported.
+
+Responses can come from chunked API requests (see `fetch_readings`) or from
+archived json files.
+
+"""
+
+from zentra.api import ZentraReadings, load_json
+import datetime
+import time
+import gzip
+import io
+import json
+import csv
+
+COLUMNS = ['sn', 'datetime', 'mrid', 'rssi', 'port',
+           'description', 'value', 'units', 'precision', 'error']
+"""The columns of a flattened readings row."""
+
+
+def fetch_readings(sn, token, start_time, end_time, window=86400):
+    """
+    Requests a device's readings from the Zentra API in time windows.
+
+    Each window is sent as a separate `ZentraReadings` request and its json
+    response is yielded without being parsed into pandas dataframes.
+
+    Parameters
+    ----------
+    sn : str
+        The serial number of the device
+    token : ZentraToken
+        The user's access token
+    start_time : int
+        Return readings with timestamps ≥ start_time. Specify start_time in UTC seconds.
+    end_time : int
+        Return readings with timestamps ≤ end_time. Specify end_time in UTC seconds.
+    window : int, optional
+        The length of each request window, in seconds. Defaults to one day.
+
+    Yields
+    ------
+    dict
+        a json response from the Zentra server
+
+    """
+    for window_start in range(start_time, end_time + 1, window):
+        window_end = min(window_start + window - 1, end_time)
+        yield ZentraReadings().build(sn, token,
+                                     start_time=window_start,
+                                     end_time=window_end).make_request().response
+
+
+def iter_rows(response):
+    """
+    Flattens a readings response into one row per measurement.
+
+    The rows hold the same fields as the `values` of a `ZentraTimeseriesRecord`,
+    plus the device serial number.
+
+    Parameters
+    ----------
+    response : dict
+        a json response from a ZentraReadings API call
+
+    Yields
+    ------
+    dict
+        a row keyed by the `COLUMNS` names
+
+    """
+    sn = response['device']['device_info'].get('device_sn')
+    for record in response['device']['timeseries']:
+        for reading in record['configuration']['values']:
+            timestamp, mrid, rssi = reading[:3]
+            # every measurement in a reading shares its timestamp
+            reading_time = datetime.datetime.fromtimestamp(
+                timestamp, datetime.timezone.utc)
+            for port, measurements in enumerate(reading[3:], start=1):
+                for measurement in measurements:
+                    row = {'sn': sn,
+                           'datetime': reading_time,
+                           'mrid': mrid,
+                           'rssi': rssi,
+                           'port': str(port)}
+                    row.update(measurement)
+                    yield row
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        type(value).__name__))
+
+
+def export_readings(responses, path, fmt=None, compress=None, columns=COLUMNS, buffer_size=1 << 20):
+    """
+    Writes readings responses to a CSV or NDJSON file, one row per measurement.
+
+    Responses are consumed one at a time, so peak memory is bounded by the
+    largest single response rather than by the total number of rows.
+
+    Parameters
+    ----------
+    responses : iterable
+        json responses from ZentraReadings API calls, or paths to local json files
+        holding them (such as those yielded by `fetch_readings`).
+    path : str
+        The path of the file to write.
+    fmt : str, optional
+        Either "csv" or "ndjson". Inferred from the path if not given; paths
+        ending in ".ndjson" or ".jsonl" (optionally followed by ".gz") are
+        written as NDJSON, everything else as CSV.
+    compress : bool, optional
+        Whether to gzip the output. Inferred from a ".gz" suffix if not given.
+    columns : list, optional
+        The row fields to write. Defaults to `COLUMNS`.
+    buffer_size : int, optional
+        The size of the write buffer, in bytes. With compression, rows are
+        buffered before being compressed.
+
+    Returns
+    -------
+    dict
+        the number of rows written, the elapsed seconds and the rows per second
+
+    """
+    path = str(path)
+    if compress is None:
+        compress = path.endswith('.gz')
+    if fmt is None:
+        stem = path[:-3] if path.endswith('.gz') else path
+        fmt = 'ndjson' if stem.endswith(('.ndjson', '.jsonl')) else 'csv'
+    if fmt not in ('csv', 'ndjson'):
+        raise Exception('"fmt" must be either "csv" or "ndjson".')
+
+    if compress:
+        # buffer before the compressor, which would otherwise be called per row
+        f = io.TextIOWrapper(io.BufferedWriter(gzip.GzipFile(path, 'wb'), buffer_size),
+                             encoding='utf-8', newline='')
+    else:
+        f = open(path, 'w', encoding='utf-8', newline='', buffering=buffer_size)
+
+    rows = 0
+    started = time.perf_counter()
+    with f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+        for response in responses:
+            if not isinstance(response, dict):
+                response = load_json(response)
+            if fmt == 'csv':
+                for row in iter_rows(response):
+                    writer.writerow(row)
+                    rows += 1
+            else:
+                for row in iter_rows(response):
+                    f.write(json.dumps({k: row.get(k) for k in columns},
+                                       default=_json_default))
+                    f.write('\n')
+                    rows += 1
+    seconds = time.perf_counter() - started
+
+    return {'rows': rows,
+            'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds else float('inf')}
@@ -0,0 +1,150 @@
+"""Detection and repair of gaps in stored readings
+
+Each reading a device records has a measurement record id (mrid), increasing
+by one per reading. Loggers can upload late and out of order, leaving holes
+in stored readings. This module finds missing and duplicated mrids in a
+device's readings, requests only the missing mrid ranges from the Zentra API,
+and merges them into the stored readings.
+
+"""
+
+from zentra.api import ZentraReadings
+from zentra.dataframe import readings_frame
+import pandas as pd
+import numpy as np
+
+KEY = ['sn', 'mrid', 'port', 'description']
+"""The columns identifying a single measurement in a readings dataframe."""
+
+
+def find_gaps(mrids, start_mrid=None, end_mrid=None):
+    """
+    Finds the ranges of mrids missing from a device's readings.
+
+    Parameters
+    ----------
+    mrids : array-like
+        The mrids of a device's readings, in any order and possibly repeated.
+    start_mrid : int, optional
+        The first mrid expected. Missing mrids before the first reading are
+        only reported if this is included.
+    end_mrid : int, optional
+        The last mrid expected. Missing mrids after the last reading are
+        only reported if this is included.
+
+    Returns
+    -------
+    np.ndarray
+        an (n, 2) array of inclusive [start_mrid, end_mrid] ranges
+
+    """
+    mrids = np.unique(np.asarray(mrids, dtype='int64'))
+    if start_mrid is not None:
+        mrids = np.concatenate(([start_mrid - 1], mrids[mrids >= start_mrid]))
+    if end_mrid is not None:
+        mrids = np.concatenate((mrids[mrids <= end_mrid], [end_mrid + 1]))
+
+    breaks = np.flatnonzero(np.diff(mrids) > 1)
+
+    return np.column_stack((mrids[breaks] + 1, mrids[breaks + 1] - 1))
+
+
+def find_duplicates(readings):
+    """
+    Finds measurements that appear more than once in a readings dataframe.
+
+    Parameters
+    ----------
+    readings : pd.DataFrame
+        A readings dataframe, such as one built by `zentra.dataframe.readings_frame`
+        or the `values` of a ZentraTimeseriesRecord.
+
+    Returns
+    -------
+    pd.DataFrame
+        every row whose measurement (see `KEY`) is repeated
+
+    """
+    key = [column for column in KEY if column in readings.columns]
+
+    return readings[readings.duplicated(key, keep=False)]
+
+
+def _sort_key(column):
+    # ports are stored as strings, but are numbered
+    return pd.to_numeric(column, errors='coerce') if column.name == 'port' else column
+
+
+def merge_readings(readings, *others):
+    """
+    Merges readings dataframes, dropping repeated measurements.
+
+    Rows already in `readings` take precedence, so merging the same readings
+    again leaves the result unchanged.
+
+    Parameters
+    ----------
+    readings : pd.DataFrame
+        The stored readings, with a `sn` column.
+    others : pd.DataFrame
+        The readings to merge into them, each with a `sn` column.
+
+    Returns
+    -------
+    pd.DataFrame
+        the merged readings, sorted by sn, mrid and port
+
+    """
+    frames = (readings,) + others
+    if any('sn' not in frame.columns for frame in frames):
+        raise Exception(
+            'Readings must include a "sn" column to be merged.')
+
+    return pd.concat(frames, ignore_index=True). \
+        drop_duplicates(KEY). \
+        sort_values(['sn', 'mrid', 'port'], kind='stable', key=_sort_key). \
+        reset_index(drop=True)
+
+
+def fill_gaps(readings, sn, token, start_mrid=None, end_mrid=None):
+    """
+    Requests a device's missing readings and merges them into its stored readings.
+
+    One request is sent per missing mrid range, so only missing readings are
+    downloaded.
+
+    Parameters
+    ----------
+    readings : pd.DataFrame
+        The stored readings of the device. A `sn` column is added if missing,
+        as in the `values` of a ZentraTimeseriesRecord; otherwise it must only
+        hold `sn`.
+    sn : str
+        The serial number of the device
+    token : ZentraToken
+        The user's access token
+    start_mrid : int, optional
+        The first mrid expected (see `find_gaps`).
+    end_mrid : int, optional
+        The last mrid expected (see `find_gaps`).
+
+    Returns
+    -------
+    pd.DataFrame
+        the merged readings
+
+    """
+    if 'sn' not in readings.columns:
+        readings = readings.assign(sn=sn)
+    elif (readings['sn'] != sn).any():
+        raise Exception(
+            'Readings must only include the device "{}".'.format(sn))
+    gaps = find_gaps(readings['mrid'].to_numpy(), start_mrid, end_mrid)
+    responses = [ZentraReadings().build(sn, token,
+                                        start_mrid=int(gap_start),
+                                        end_mrid=int(gap_end)).make_request().response
+                 for gap_start, gap_end in gaps]
+    if not responses:
+        return readings
+
+    return merge_readings(readings, readings_frame(responses))
@@ -0,0 +1,222 @@
+"""Fleet-wide index of sensor metadata
+
+This module indexes the sensor configurations reported by many devices, so
+that questions like "which ports measure Water Content with a TEROS 12?" can
+be answered with dictionary lookups rather than by fetching and scanning each
+device's readings.
+
+The index is built from the configurations of parsed `ZentraReadings` objects
+(the `sensors` and `values` of each `ZentraTimeseriesRecord`) or of raw responses,
+updated incrementally as new configurations appear, and persisted locally as
+a json file.
+
+"""
+
+from collections import defaultdict
+from operator import attrgetter, itemgetter
+from bisect import bisect_right
+import json
+import os
+
+FIELDS = ('sensor', 'measurement', 'units', 'port')
+"""The fields a sensor configuration can be looked up by."""
+
+
+def _entries(sensors, measurements):
+    """
+    Builds the index entries of a configuration from its sensor names and
+    measurements, both keyed by port.
+    """
+    entries = []
+    for port, sensor in sorted(sensors.items()):
+        for description, units in measurements.get(port) or [(None, None)]:
+            entries.append([port, sensor, description,
+                            units.strip() if isinstance(units, str) else None])
+
+    return entries
+
+
+def _response_entries(configuration):
+    sensors = {sensor['port']: sensor.get('sensor_name')
+               for sensor in configuration['sensors']}
+    # a configuration's measurements are described by its first reading
+    reading = configuration['values'][0][3:] if configuration['values'] else []
+    measurements = {port: [(measurement.get('description'), measurement.get('units'))
+                           for measurement in port_measurements]
+                    for port, port_measurements in enumerate(reading, start=1)}
+
+    return _entries(sensors, measurements)
+
+
+def _record_entries(record):
+    names = record.sensors['sensor_name'].tolist() if 'sensor_name' in record.sensors.columns \
+        else [None] * len(record.sensors)
+    sensors = dict(zip(record.sensors['port'].tolist(), names))
+    # a configuration's measurements are described by its first reading
+    values = record.values
+    reading = values[values['mrid'] == values['mrid'].iat[0]] if len(values) else values
+    measurements = defaultdict(list)
+    for port, description, units in zip(reading['port'].tolist(), reading['description'].tolist(),
+                                        reading['units'].tolist()):
+        measurements[int(port)].append((description, units))
+
+    return _entries(sensors, measurements)
+
+
+class SensorIndex:
+    """
+    A class used to represent an index of sensor configurations
+
+    Attributes
+    ----------
+    path : str
+        the path of the json file the index is persisted to
+    configurations : dict
+        the indexed configurations, keyed by serial number then valid_since, each
+        a list of [port, sensor, measurement, units] entries
+
+    """
+
+    def __init__(self, path=None):
+        """
+        Initializes a SensorIndex, loading it from a local json file if it exists.
+
+        Parameters
+        ----------
+        path : str, optional
+            The path of the json file the index is persisted to.
+
+        """
+        self.path = path
+        self.configurations = {}
+        self._entries = defaultdict(set)
+        self._keys = {field: defaultdict(set) for field in FIELDS}
+        self._starts = {}
+
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for sn, configurations in json.load(f).items():
+                    for valid_since, entries in configurations.items():
+                        self._add(sn, valid_since, entries)
+
+    def _add(self, sn, valid_since, entries):
+        self.configurations.setdefault(sn, {})[valid_since] = entries
+        self._starts.pop(sn, None)
+        for port, sensor, measurement, units in entries:
+            key = (sensor, measurement, units, port)
+            self._entries[key].add((sn, port, valid_since))
+            for field, value in zip(FIELDS, key):
+                self._keys[field][value].add(key)
+
+    def add_readings(self, readings):
+        """
+        Adds the sensor configurations of a device's readings to the index.
+
+        Configurations already in the index are skipped.
+
+        Parameters
+        ----------
+        readings : ZentraReadings or dict
+            A parsed ZentraReadings object, such as one from `zentra.archive.replay`,
+            or a json response from a ZentraReadings API call.
+
+        Returns
+        -------
+        int
+            the number of new configurations
+
+        """
+        if isinstance(readings, dict):
+            sn = readings['device']['device_info']['device_sn']
+            records = [record['configuration'] for record in readings['device']['timeseries']]
+            valid_since, entries = itemgetter('valid_since'), _response_entries
+        else:
+            sn = readings.device_info['device_sn']
+            records = readings.timeseries
+            valid_since, entries = attrgetter('valid_since'), _record_entries
+
+        added = 0
+        for record in records:
+            if valid_since(record) in self.configurations.get(sn, {}):
+                continue
+            self._add(sn, valid_since(record), entries(record))
+            added += 1
+
+        return added
+
+    def save(self, path=None):
+        """
+        Persists the index to a local json file.
+
+        Parameters
+        ----------
+        path : str, optional
+            The path of the json file. Defaults to the path the index was loaded from.
+
+        """
+        path = path or self.path
+        if not path:
+            raise Exception('"path" must be included.')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.configurations, f)
+
+        return self
+
+    def _valid_until(self, sn, valid_since):
+        if sn not in self._starts:
+            self._starts[sn] = sorted(self.configurations[sn])
+        starts = self._starts[sn]
+        following = bisect_right(starts, valid_since)
+
+        return starts[following] if following < len(starts) else None
+
+    def find(self, sensor=None, measurement=None, units=None, port=None):
+        """
+        Finds the device ports matching a sensor configuration.
+
+        Parameters
+        ----------
+        sensor : str, optional
+            The sensor name, e.g. "TEROS 12"
+        measurement : str, optional
+            The measurement description, e.g. "Water Content"
+        units : str, optional
+            The measurement units, e.g. "m³/m³"
+        port : int, optional
+            The device port
+
+        Returns
+        -------
+        list
+            sorted (sn, port, valid_since, valid_until) tuples, where valid_until is
+            when the device's next configuration became valid, or None
+
+        """
+        query = dict(zip(FIELDS, (sensor, measurement, units, port)))
+        if all(value is not None for value in query.values()):
+            keys = {(sensor, measurement, units, port)}
+        else:
+            key_sets = [self._keys[field].get(value, set())
+                        for field, value in query.items() if value is not None]
+            keys = set.intersection(*key_sets) if key_sets else set(self._entries)
+
+        matches = set()
+        for key in keys:
+            matches.update(self._entries.get(key, ()))
+
+        return sorted((sn, port, valid_since, self._valid_until(sn, valid_since))
+                      for sn, port, valid_since in matches)
+
+    def serials(self, sensor=None, measurement=None, units=None, port=None):
+        """
+        Finds the serial numbers of devices matching a sensor configuration.
+
+        Parameters are as for `find`.
+
+        Returns
+        -------
+        set
+            the serial numbers of the matching devices
+
+        """
+        return {match[0] for match in self.find(sensor, measurement, units, port)}
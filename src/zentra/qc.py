@@ -0,0 +1,186 @@
+"""Quality control of Zentra readings
+
+This module flags suspect readings with range, step, spike, flat-line and
+sensor error checks. The checks applied to each measurement are chosen by its
+description and units, and are evaluated on NumPy arrays, one series (device,
+port and measurement) at a time. Results are stored as a bitmask in a
+`qc_flags` column.
+
+Readings can be checked in chunks, such as those streamed from the Zentra API:
+a `QualityControl` object carries the end of each series over to the next
+chunk, so flags do not depend on where the chunks are split.
+
+"""
+
+from numpy.lib.stride_tricks import sliding_window_view
+import numpy as np
+
+RANGE = 1
+"""Flag for values outside the measurement's valid range."""
+STEP = 2
+"""Flag for values that changed too much since the previous value."""
+SPIKE = 4
+"""Flag for values that differ too much from the median of the previous `SPIKE_WINDOW` values."""
+FLAT = 8
+"""Flag for values repeated too many times in a row."""
+ERROR = 16
+"""Flag for values reported as errors by the sensor, or missing."""
+
+SPIKE_WINDOW = 3
+"""The number of previous values a spike is measured against."""
+
+RULES = {
+    ('Water Content', 'm³/m³'): {'min': 0.0, 'max': 0.7, 'step': 0.15, 'spike': 0.1},
+    ('Soil Temperature', '°C'): {'min': -40.0, 'max': 60.0, 'step': 5.0, 'spike': 5.0},
+    ('Air Temperature', '°C'): {'min': -50.0, 'max': 60.0, 'step': 10.0, 'spike': 8.0, 'flat': 12},
+    ('Relative Humidity', 'RH'): {'min': 0.0, 'max': 1.0, 'flat': 24},
+    ('Relative Humidity', '%'): {'min': 0.0, 'max': 100.0, 'flat': 24},
+    ('Atmospheric Pressure', 'kPa'): {'min': 50.0, 'max': 110.0, 'step': 1.0, 'flat': 24},
+    ('Vapor Pressure', 'kPa'): {'min': 0.0, 'max': 8.0},
+    ('Solar Radiation', 'W/m²'): {'min': 0.0, 'max': 1750.0},
+    ('Precipitation', 'mm'): {'min': 0.0, 'max': 100.0},
+    ('Wind Speed', 'm/s'): {'min': 0.0, 'max': 75.0},
+    ('Gust Speed', 'm/s'): {'min': 0.0, 'max': 75.0},
+    ('Wind Direction', '°'): {'min': 0.0, 'max': 360.0},
+}
+"""
+The default checks, keyed by measurement description and units. A units of
+None matches any units. Each rule may include a valid 'min' and 'max', the
+largest 'step' between consecutive values, the largest 'spike' from the
+previous values' median, and the number of repeated values ('flat') that
+counts as a flat line.
+"""
+
+SERIES = ['sn', 'port', 'description']
+"""The columns identifying a series of readings."""
+
+
+def _rule(rules, description, units):
+    units = units.strip() if isinstance(units, str) else units
+
+    return rules.get((description, units)) or rules.get((description, None)) or {}
+
+
+def _check(values, tail, rule):
+    """
+    Flags a series' values, given the previous values carried over from earlier chunks.
+    """
+    flags = np.zeros(len(values), dtype='uint8')
+    with np.errstate(invalid='ignore'):
+        extended = np.concatenate((tail, values))
+        current = len(tail)
+        if rule.get('step') is not None:
+            previous = np.concatenate(([np.nan], extended[:-1]))[current:]
+            flags[np.abs(values - previous) > rule['step']] |= STEP
+        if rule.get('spike') is not None:
+            padded = np.concatenate((np.full(SPIKE_WINDOW, np.nan), extended[:-1]))
+            median = np.median(sliding_window_view(padded, SPIKE_WINDOW), axis=1)[current:]
+            flags[np.abs(values - median) > rule['spike']] |= SPIKE
+        if rule.get('flat'):
+            padded = np.concatenate((np.full(rule['flat'] - 1, np.nan), extended))
+            windows = sliding_window_view(padded, rule['flat'])[current:]
+            flags[windows.max(axis=1) == windows.min(axis=1)] |= FLAT
+
+    return flags, extended
+
+
+class QualityControl:
+    """
+    A class used to represent the quality control of streamed readings
+
+    Attributes
+    ----------
+    rules : dict
+        the checks applied to each measurement, keyed by description and units
+        (see `RULES`)
+    tails : dict
+        the last values of each series, carried over to the next chunk
+
+    """
+
+    def __init__(self, rules=RULES):
+        """
+        Initializes a QualityControl object
+
+        Parameters
+        ----------
+        rules : dict, optional
+            The checks applied to each measurement. Defaults to `RULES`.
+
+        """
+        self.rules = rules
+        self.tails = {}
+
+    def process(self, readings):
+        """
+        Flags a chunk of readings.
+
+        Readings within each series must be in time order, and chunks must be
+        processed in time order.
+
+        Parameters
+        ----------
+        readings : pd.DataFrame
+            A readings dataframe, such as one built by `zentra.dataframe.readings_frame`
+            or the `values` of a ZentraTimeseriesRecord.
+
+        Returns
+        -------
+        pd.DataFrame
+            the readings with a `qc_flags` bitmask column
+
+        """
+        series = [column for column in SERIES if column in readings.columns]
+        values = readings['value'].to_numpy(dtype='float64', na_value=np.nan)
+        flags = np.zeros(len(readings), dtype='uint8')
+
+        invalid = np.isnan(values)
+        if 'error' in readings.columns:
+            invalid |= readings['error'].to_numpy(dtype=bool, na_value=False)
+        flags[invalid] |= ERROR
+
+        for key, rows in readings.groupby(series, sort=False).indices.items():
+            key = key if isinstance(key, tuple) else (key,)
+            rule = _rule(self.rules, dict(zip(series, key)).get('description'),
+                         readings['units'].iat[rows[0]] if 'units' in readings.columns else None)
+            if not rule:
+                continue
+
+            rows = rows[~invalid[rows]]
+            out_of_range = np.zeros(len(rows), dtype=bool)
+            if rule.get('min') is not None:
+                out_of_range |= values[rows] < rule['min']
+            if rule.get('max') is not None:
+                out_of_range |= values[rows] > rule['max']
+            flags[rows[out_of_range]] |= RANGE
+
+            # only valid, in-range values are checked against, and carried over
+            rows = rows[~out_of_range]
+            if not len(rows):
+                continue
+            carried = max(SPIKE_WINDOW, rule.get('flat', 1) - 1)
+            series_flags, extended = _check(values[rows], self.tails.get(key, np.empty(0)), rule)
+            flags[rows] |= series_flags
+            self.tails[key] = extended[-carried:]
+
+        return readings.assign(qc_flags=flags)
+
+
+def flag_readings(readings, rules=RULES):
+    """
+    Flags readings in a single pass.
+
+    Parameters
+    ----------
+    readings : pd.DataFrame
+        A readings dataframe (see `QualityControl.process`).
+    rules : dict, optional
+        The checks applied to each measurement. Defaults to `RULES`.
+
+    Returns
+    -------
+    pd.DataFrame
+        the readings with a `qc_flags` bitmask column
+
+    """
+    return QualityControl(rules).process(readings)
@@ -0,0 +1,161 @@
+"""Shared instances of repeated configurations
+
+Devices report the same sensor and settings configurations over and over:
+in every readings window, in every re-fetch, and across identically
+configured stations. This module keeps one dataframe per distinct
+configuration, identified by a hash of its json records, so that parsed
+objects share its data instead of each building their own copy.
+
+Each parsed object gets its own shallow view of the shared dataframe, whose
+NumPy columns are read-only, so modifying one object's configuration never
+changes another's. With copy-on-write pandas (pandas 3, or the
+`mode.copy_on_write` option), a view is copied when it is first modified.
+Otherwise, modifying a view's values in place raises an exception: copy the
+configuration first (e.g. `record.sensors = record.sensors.copy()`).
+
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+
+
+def _configuration_id(records):
+    return hashlib.blake2b(
+        json.dumps(records, sort_keys=True, separators=(',', ':')).encode('utf-8'),
+        digest_size=16).hexdigest()
+
+
+def _freeze(frame):
+    """
+    Rebuilds a dataframe on read-only copies of its NumPy columns, kept as
+    separate blocks so that pandas does not consolidate them into new arrays.
+    """
+    columns = {}
+    for i in range(frame.shape[1]):
+        column = frame.iloc[:, i]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+            column = pd.Series(values, index=frame.index, dtype=column.dtype, copy=False)
+        columns[i] = column
+    frozen = pd.DataFrame(columns, index=frame.index, copy=False)
+    frozen.columns = frame.columns
+
+    return frozen
+
+
+def _view(frame):
+    # a shallow copy shares the frozen data, and its own columns can be replaced
+    return frame.copy(deep=False)
+
+
+class ConfigurationRegistry:
+    """
+    A class used to represent a registry of shared configuration dataframes
+
+    The registry holds one dataframe per distinct configuration, and hands
+    out views of it. Configurations are few, so they are kept until `clear`
+    is called.
+
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ConfigurationRegistry
+        """
+        self._frames = {}
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, configuration_id):
+        return configuration_id in self._frames
+
+    def clear(self):
+        """
+        Drops all registered configurations. Views already handed out are unaffected.
+        """
+        self._frames.clear()
+
+        return self
+
+    def get(self, configuration_id):
+        """
+        Gets a view of a shared configuration dataframe by its id.
+
+        Parameters
+        ----------
+        configuration_id : str
+            The id of the configuration
+
+        Returns
+        -------
+        pd.DataFrame
+            a view of the shared dataframe, or None if it is not registered
+
+        """
+        frame = self._frames.get(configuration_id)
+
+        return None if frame is None else _view(frame)
+
+    def register(self, configuration_id, frame):
+        """
+        Shares a configuration dataframe restored with its id, such as one unpickled.
+
+        The dataframe is only shared if it still holds the configuration with
+        that id: it is compared with the registered dataframe, or, if none is
+        registered, its records are hashed. A modified dataframe is returned
+        as is, and is not registered.
+
+        Parameters
+        ----------
+        configuration_id : str
+            The id the configuration was registered with
+        frame : pd.DataFrame
+            The configuration dataframe
+
+        Returns
+        -------
+        tuple
+            the id of the configuration and a view of its shared dataframe, or
+            None and `frame` if it does not hold that configuration
+
+        """
+        registered = self._frames.get(configuration_id)
+        if registered is None:
+            if _configuration_id(frame.to_dict('records')) != configuration_id:
+                return None, frame
+            registered = self._frames.setdefault(configuration_id, _freeze(frame))
+        elif not registered.equals(frame):
+            return None, frame
+
+        return configuration_id, _view(registered)
+
+    def intern(self, records):
+        """
+        Gets a view of the shared dataframe of a configuration, building it if it is new.
+
+        Parameters
+        ----------
+        records : list
+            The json records of the configuration, e.g. the `sensors` of a
+            readings configuration.
+
+        Returns
+        -------
+        tuple
+            the id of the configuration and a view of its shared dataframe
+
+        """
+        configuration_id = _configuration_id(records)
+        frame = self._frames.get(configuration_id)
+        if frame is None:
+            frame = self._frames.setdefault(configuration_id, _freeze(pd.DataFrame(records)))
+
+        return configuration_id, _view(frame)
+
+
+CONFIGURATIONS = ConfigurationRegistry()
+"""The registry shared by all parsed objects."""
@@ -0,0 +1,171 @@
+"""Incremental tracking of device statuses
+
+This module keeps, for each device in a fleet, the time of the last cellular
+status seen and the last error counter values, persisted in a local json
+file. Each update requests only the statuses since the last one seen, and
+reports what changed: new cellular statuses and counter deltas. The first
+values seen for a counter are its baseline.
+
+Error counters are treated as cumulative totals reported by each device.
+
+"""
+
+from zentra.api import ZentraStatus
+import pandas as pd
+import json
+import os
+
+TIME_COLUMN = 'timestamp_utc'
+"""The cellular status column holding the status time, in UTC seconds."""
+
+
+def _counters(status):
+    """
+    Flattens a device's error counters into a dictionary of numeric values.
+    """
+    counters = {}
+    for prefix, group in (('device', status.device_error_counters),
+                          ('cellular', status.cellular_error_counters)):
+        for name, value in (group or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                counters[prefix + '.' + name] = value
+
+    sensor_errors = (status.device_error_counters or {}).get('sensor_errors')
+    if isinstance(sensor_errors, pd.DataFrame) and 'port' in sensor_errors.columns:
+        sensor_errors = sensor_errors.set_index('port').select_dtypes('number').stack()
+        for (port, name), value in zip(sensor_errors.index, sensor_errors.tolist()):
+            counters['sensor.{}.{}'.format(port, name)] = value
+
+    return counters
+
+
+class StatusTracker:
+    """
+    A class used to represent the last seen statuses of a fleet of devices
+
+    Attributes
+    ----------
+    path : str
+        the path of the json file the tracker is persisted to
+    last_times : dict
+        the time of the last cellular status seen, in UTC seconds, keyed by serial number
+    counters : dict
+        the last error counter values seen, keyed by serial number then counter name
+
+    """
+
+    def __init__(self, path=None, time_column=TIME_COLUMN):
+        """
+        Initializes a StatusTracker, loading it from a local json file if it exists.
+
+        Parameters
+        ----------
+        path : str, optional
+            The path of the json file the tracker is persisted to.
+        time_column : str, optional
+            The cellular status column holding the status time. Defaults to `TIME_COLUMN`.
+
+        """
+        self.path = path
+        self.time_column = time_column
+        self.last_times = {}
+        self.counters = {}
+
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.last_times = state['last_times']
+            self.counters = state['counters']
+
+    def update(self, token, serials):
+        """
+        Requests the statuses of devices since they were last seen and reports changes.
+
+        Parameters
+        ----------
+        token : ZentraToken
+            The user's access token
+        serials : list
+            The serial numbers of the devices
+
+        Returns
+        -------
+        dict
+            the change set (see `changes`)
+
+        """
+        statuses = {}
+        for sn in serials:
+            last_time = self.last_times.get(sn)
+            statuses[sn] = ZentraStatus(sn=sn, token=token,
+                                        start_time=None if last_time is None else last_time + 1)
+
+        return self.changes(statuses)
+
+    def changes(self, statuses):
+        """
+        Reports the changes in parsed statuses since the devices were last seen,
+        and records them as seen.
+
+        Parameters
+        ----------
+        statuses : dict
+            Parsed ZentraStatus objects, keyed by serial number.
+
+        Returns
+        -------
+        dict
+            the change set, with a 'cellular_statuses' DataFrame of statuses newer
+            than the last seen (with a 'sn' column) and a 'counters' DataFrame of the
+            changed counters, with 'sn', 'counter', 'previous', 'current' and
+            'delta' columns. Counters seen for the first time are recorded as a
+            baseline and not reported.
+
+        """
+        cellular = [status.cellular_statuses.assign(sn=sn)
+                    for sn, status in statuses.items()
+                    if status.cellular_statuses is not None and not status.cellular_statuses.empty]
+        cellular = pd.concat(cellular, ignore_index=True) if cellular else \
+            pd.DataFrame({self.time_column: [], 'sn': []})
+        last_times = cellular['sn'].map(self.last_times).astype('float64')
+        cellular = cellular[~(cellular[self.time_column] <= last_times)]
+        self.last_times.update({sn: int(last_time) for sn, last_time in
+                                cellular.groupby('sn')[self.time_column].max().items()})
+
+        current = pd.DataFrame([(sn, counter, value)
+                                for sn, status in statuses.items()
+                                for counter, value in _counters(status).items()],
+                               columns=['sn', 'counter', 'current'])
+        previous = pd.DataFrame([(sn, counter, value)
+                                 for sn in statuses
+                                 for counter, value in self.counters.get(sn, {}).items()],
+                                columns=['sn', 'counter', 'previous'])
+        counters = current.merge(previous, on=['sn', 'counter'], how='left')
+        counters['delta'] = counters['current'] - counters['previous'].astype('float64')
+        for sn, counter, value in zip(current['sn'], current['counter'], current['current'].tolist()):
+            self.counters.setdefault(sn, {})[counter] = value
+        # counters seen for the first time only set a baseline
+        counters = counters[counters['delta'].notna() & (counters['delta'] != 0)]. \
+            reindex(columns=['sn', 'counter', 'previous', 'current', 'delta'])
+
+        return {'cellular_statuses': cellular.reset_index(drop=True),
+                'counters': counters.reset_index(drop=True)}
+
+    def save(self, path=None):
+        """
+        Persists the tracker to a local json file.
+
+        Parameters
+        ----------
+        path : str, optional
+            The path of the json file. Defaults to the path the tracker was loaded from.
+
+        """
+        path = path or self.path
+        if not path:
+            raise Exception('"path" must be included.')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'last_times': self.last_times,
+                       'counters': self.counters}, f)
+
+        return self
@@ -8,4 +8,38 @@
     https://pytest.org/latest/plugins.html
 """
 
-# import pytest
+import pytest
+
+
+def _measurement(description, value, units):
+    return {'description': description,
+            'value': value,
+            'units': units,
+            'precision': 3,
+            'error': False}
+
+
+def _readings_response(sn="06-00187", mrids=range(100, 103), start_time=1561939200):
+    """
+    Builds an offline ZentraReadings json response with two sensor ports.
+    """
+    return {'device': {'device_info': {'device_sn': sn},
+                       'timeseries': [{'configuration': {
+                           'valid_since': '2019-07-01 00:00:00',
+                           'sensors': [{'port': 1, 'sensor_name': 'TEROS 12', 'sensor_number': 119},
+                                       {'port': 2, 'sensor_name': 'ATMOS 14', 'sensor_number': 111}],
+                           'values': [[start_time + 300 * (mrid - 100), mrid, -80,
+                                       [_measurement('Water Content', 0.3, ' m³/m³'),
+                                        _measurement('Soil Temperature', 20.0, ' °C')],
+                                       [_measurement('Air Temperature', 15.0, ' °C')]]
+                                      for mrid in mrids]}}]}}
+
+
+@pytest.fixture
+def make_readings_response():
+    return _readings_response
+
+
+@pytest.fixture
+def readings_response():
+    return _readings_response()
@@ -0,0 +1,67 @@
+import gzip
+import json
+import pytest
+from zentra.api import ZentraReadings
+from zentra.archive import *
+
+
+@pytest.fixture
+def write_archive(make_readings_response):
+    def write(directory, count=3):
+        directory.mkdir()
+        for i in range(count):
+            with gzip.open(directory / "{}.json.gz".format(i), 'wt', encoding='utf-8') as f:
+                json.dump(make_readings_response(mrids=range(100 + 3 * i, 103 + 3 * i)), f)
+        (directory / "plain.json").write_text(json.dumps(make_readings_response()), encoding='utf-8')
+    return write
+
+
+def test_json_file_gz(readings_response, tmp_path):
+    json_file = tmp_path / "readings.json.gz"
+    with gzip.open(json_file, 'wt', encoding='utf-8') as f:
+        json.dump(readings_response, f)
+    assert ZentraReadings(json_file=str(json_file)).device_info['device_sn'] == "06-00187"
+
+
+def test_find_json_files(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    assert len(find_json_files(tmp_path / "archive")) == 4
+    assert len(find_json_files(str(tmp_path / "archive" / "*.json.gz"))) == 3
+
+
+def test_replay(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    readings = list(replay(tmp_path / "archive", workers=2))
+    assert len(readings) == 4
+    assert readings[0].timeseries[0].values['mrid'].min() == 100
+    assert readings[0].response is None
+
+
+def test_replay_keep_response(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    readings = list(replay(tmp_path / "archive", workers=2, keep_response=True))
+    assert readings[0].response['device']['device_info']['device_sn'] == "06-00187"
+
+
+def test_replay_threads(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    assert len(list(replay(tmp_path / "archive", processes=False, max_pending=1))) == 4
+
+
+def test_replay_frame(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    assert len(replay_frame(tmp_path / "archive", workers=2)) == 36
+
+
+def test_replay_errors(write_archive, tmp_path):
+    write_archive(tmp_path / "archive")
+    with open(tmp_path / "archive" / "1.json.gz", 'r+b') as f:
+        f.truncate(20)
+    (tmp_path / "archive" / "broken.json").write_text('{"device": ', encoding='utf-8')
+    with pytest.raises(Exception, match="1.json.gz"):
+        list(replay(tmp_path / "archive", workers=2))
+    with pytest.warns(UserWarning) as skipped:
+        assert len(list(replay(tmp_path / "archive", workers=2, errors='skip'))) == 3
+    assert ["1.json.gz" in str(w.message) for w in skipped] == [True, False]
+    with pytest.warns(UserWarning):
+        assert len(replay_frame(tmp_path / "archive", processes=False, errors='skip')) == 27
@@ -0,0 +1,47 @@
+import gzip
+import json
+import pytest
+from zentra.dataframe import *
+
+
+def test_readings_frame(readings_response):
+    frame = readings_frame([readings_response])
+    assert len(frame) == 9
+    assert dict(frame.dtypes) == dict(empty_frame().dtypes)
+
+
+def test_readings_frame_empty():
+    assert readings_frame([]).empty
+
+
+def test_read_zentra_archive(make_readings_response, tmp_path):
+    pytest.importorskip("dask.dataframe")
+    for sn in ["06-00187", "06-00761"]:
+        for start_time in [1561939200, 1562025600]:
+            with gzip.open(tmp_path / "{}-{}.json.gz".format(sn, start_time), 'wt', encoding='utf-8') as f:
+                json.dump(make_readings_response(sn=sn, start_time=start_time), f)
+    frame = read_zentra(["06-00187", "06-00761"],
+                        start_time=1561939200,
+                        end_time=1562111999,
+                        archive=str(tmp_path / "{sn}-{start_time}.json.gz"))
+    assert frame.npartitions == 4
+    assert list(frame.columns) == list(empty_frame().columns)
+    assert len(frame.compute()) == 36
+
+
+def test_read_zentra_no_source():
+    pytest.importorskip("dask.dataframe")
+    with pytest.raises(Exception):
+        read_zentra(["06-00187"], start_time=0, end_time=1)
+
+
+def test_read_zentra_missing_archive(make_readings_response, tmp_path):
+    pytest.importorskip("dask.dataframe")
+    with gzip.open(tmp_path / "06-00187-1561939200.json.gz", 'wt', encoding='utf-8') as f:
+        json.dump(make_readings_response(), f)
+    frame = read_zentra(["06-00187"],
+                        start_time=1561939200,
+                        end_time=1562111999,
+                        archive=str(tmp_path / "{sn}-{start_time}.json.gz"))
+    with pytest.raises(Exception, match="06-00187-1562025600.json.gz"):
+        frame.compute()
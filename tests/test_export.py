@@ -0,0 +1,39 @@
+import gzip
+import json
+import pandas as pd
+from zentra.export import *
+
+
+def test_iter_rows(readings_response):
+    rows = list(iter_rows(readings_response))
+    assert len(rows) == 9
+    assert rows[0]['sn'] == "06-00187"
+    assert rows[2]['port'] == '2'
+
+
+def test_export_csv_gz(readings_response, tmp_path):
+    path = tmp_path / "readings.csv.gz"
+    stats = export_readings([readings_response, readings_response], path)
+    assert stats['rows'] == 18
+    assert list(pd.read_csv(path).columns) == COLUMNS
+
+
+def test_export_ndjson(readings_response, tmp_path):
+    path = tmp_path / "readings.ndjson"
+    assert export_readings([readings_response], path)['rows'] == 9
+    row = json.loads(path.read_text(encoding='utf-8').splitlines()[0])
+    assert row['datetime'] == '2019-07-01T00:00:00+00:00'
+
+
+def test_export_json_file(readings_response, tmp_path):
+    json_file = tmp_path / "readings.json.gz"
+    with gzip.open(json_file, 'wt', encoding='utf-8') as f:
+        json.dump(readings_response, f)
+    assert export_readings([str(json_file)], tmp_path / "readings.csv")['rows'] == 9
+
+
+def test_export_gz_buffer_size(readings_response, tmp_path):
+    path = tmp_path / "readings.ndjson.gz"
+    assert export_readings([readings_response] * 3, path, buffer_size=64)['rows'] == 27
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 27
@@ -0,0 +1,68 @@
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import pytest
+from zentra.api import ZentraReadings, ZentraTimeseriesRecord, ZentraToken
+from zentra.dataframe import readings_frame
+from zentra.gaps import *
+
+
+def test_find_gaps():
+    assert find_gaps([5, 1, 2, 2, 8]).tolist() == [[3, 4], [6, 7]]
+    assert find_gaps([5, 1, 2, 8], start_mrid=0, end_mrid=9).tolist() == [[0, 0], [3, 4], [6, 7], [9, 9]]
+    assert find_gaps([], start_mrid=1, end_mrid=3).tolist() == [[1, 3]]
+    assert find_gaps(np.arange(10)).shape == (0, 2)
+
+
+def test_find_duplicates(make_readings_response):
+    readings = readings_frame([make_readings_response(mrids=[100, 101, 101])])
+    assert find_duplicates(readings)['mrid'].unique().tolist() == [101]
+
+
+def test_fill_gaps(make_readings_response, monkeypatch):
+    requested = []
+
+    def make_request(self):
+        params = parse_qs(urlparse(self.request.url).query)
+        mrids = range(int(params['start_mrid'][0]), int(params['end_mrid'][0]) + 1)
+        requested.append(list(mrids))
+        self.response = make_readings_response(mrids=mrids)
+        return self
+
+    monkeypatch.setattr(ZentraReadings, 'make_request', make_request)
+    readings = readings_frame([make_readings_response(mrids=[100, 103, 104])])
+    filled = fill_gaps(readings, "06-00187", ZentraToken(token="token"), end_mrid=105)
+    assert requested == [[101, 102], [105]]
+    assert filled['mrid'].unique().tolist() == list(range(100, 106))
+    assert merge_readings(filled, readings).equals(filled)
+
+
+def test_fill_gaps_timeseries_values(make_readings_response, monkeypatch):
+    def make_request(self):
+        self.response = make_readings_response(mrids=[101])
+        return self
+
+    monkeypatch.setattr(ZentraReadings, 'make_request', make_request)
+    readings = ZentraTimeseriesRecord(make_readings_response(mrids=[100, 102])['device']['timeseries'][0]).values
+    filled = fill_gaps(readings, "06-00187", ZentraToken(token="token"))
+    assert filled['sn'].unique().tolist() == ["06-00187"]
+    assert filled['mrid'].unique().tolist() == [100, 101, 102]
+    assert len(merge_readings(filled, readings_frame([make_readings_response(mrids=[100, 101, 102])]))) == len(filled)
+
+
+def test_merge_readings_requires_sn(readings_response):
+    readings = readings_frame([readings_response])
+    with pytest.raises(Exception):
+        merge_readings(readings, readings.drop(columns='sn'))
+
+
+def test_fill_gaps_single_device(make_readings_response):
+    readings = readings_frame([make_readings_response(sn="06-00187", mrids=[100, 102]),
+                               make_readings_response(sn="06-00761", mrids=[101])])
+    with pytest.raises(Exception):
+        fill_gaps(readings, "06-00187", ZentraToken(token="token"))
+
+
+def test_merge_readings_port_order(make_readings_response):
+    readings = readings_frame([make_readings_response()])
+    readings = readings.assign(port=readings['port'].map({'1': '10', '2': '2'}))
+    assert merge_readings(readings)['port'].unique().tolist() == ['2', '10']
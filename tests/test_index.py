@@ -0,0 +1,51 @@
+import gzip
+import json
+from zentra.archive import replay
+from zentra.index import *
+from zentra.serialize import to_bytes, from_bytes
+
+
+def test_index_find(readings_response):
+    index = SensorIndex()
+    assert index.add_readings(readings_response) == 1
+    assert index.add_readings(readings_response) == 0
+    assert index.find(sensor="TEROS 12", measurement="Water Content") == \
+        [("06-00187", 1, '2019-07-01 00:00:00', None)]
+    assert index.find(sensor="TEROS 12", measurement="Water Content", units="m³/m³", port=1) == \
+        index.find(measurement="Water Content")
+    assert index.find(sensor="ATMOS 14", measurement="Water Content") == []
+
+
+def test_index_valid_until(make_readings_response):
+    index = SensorIndex()
+    index.add_readings(make_readings_response())
+    later = make_readings_response()
+    later['device']['timeseries'][0]['configuration']['valid_since'] = '2019-08-01 00:00:00'
+    index.add_readings(later)
+    assert [match[3] for match in index.find(port=2)] == ['2019-08-01 00:00:00', None]
+
+
+def test_index_persist(make_readings_response, tmp_path):
+    path = str(tmp_path / "index.json")
+    index = SensorIndex(path)
+    index.add_readings(make_readings_response(sn="06-00187"))
+    index.add_readings(make_readings_response(sn="06-00761"))
+    index.save()
+    assert SensorIndex(path).serials(sensor="ATMOS 14") == {"06-00187", "06-00761"}
+
+
+def test_index_parsed_readings(make_readings_response, tmp_path):
+    for sn in ["06-00187", "06-00761"]:
+        with gzip.open(tmp_path / "{}.json.gz".format(sn), 'wt', encoding='utf-8') as f:
+            json.dump(make_readings_response(sn=sn), f)
+    index, expected = SensorIndex(), SensorIndex()
+    for readings in replay(tmp_path, workers=2):
+        assert readings.response is None
+        assert index.add_readings(readings) == 1
+    expected.add_readings(make_readings_response(sn="06-00187"))
+    expected.add_readings(make_readings_response(sn="06-00761"))
+    assert index.configurations == expected.configurations
+    assert index.serials(measurement="Water Content", units="m³/m³") == {"06-00187", "06-00761"}
+
+    readings = from_bytes(to_bytes(next(replay(tmp_path, processes=False))))
+    assert SensorIndex().add_readings(readings) == 1
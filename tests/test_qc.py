@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from zentra.dataframe import readings_frame
+from zentra.qc import *
+
+
+@pytest.fixture
+def air_temperature(make_readings_response):
+    def make(values):
+        readings = readings_frame([make_readings_response(mrids=range(100, 100 + len(values)))])
+        readings = readings[readings['description'] == 'Air Temperature'].reset_index(drop=True)
+        return readings.assign(value=values)
+    return make
+
+
+def test_flags(air_temperature):
+    values = [15.0, 15.5, 16.0, 40.0, 16.5, 99.0, np.nan] + [17.0] * 12
+    flags = flag_readings(air_temperature(values))['qc_flags']
+    assert flags[0] == 0
+    assert flags[3] == STEP | SPIKE
+    assert flags[4] == STEP
+    assert flags[5] == RANGE
+    assert flags[6] == ERROR
+    assert flags.iloc[-1] & FLAT
+    assert not flags.iloc[-2] & FLAT
+
+
+def test_reading_after_outlier(air_temperature):
+    flags = flag_readings(air_temperature([15.0, 15.5, 999.0, 16.0, 16.2, 16.1]))['qc_flags']
+    assert flags.tolist() == [0, 0, RANGE, 0, 0, 0]
+
+
+def test_chunks_match_single_pass(air_temperature):
+    values = list(np.sin(np.arange(60) / 3) * 20) + [5.0] * 15 + [60.0, 5.0]
+    readings = air_temperature(values)
+    qc = QualityControl()
+    chunked = pd.concat([qc.process(readings.iloc[start:start + 7]) for start in range(0, len(readings), 7)])
+    assert (chunked['qc_flags'].to_numpy() == flag_readings(readings)['qc_flags'].to_numpy()).all()
+    assert chunked['qc_flags'].any()
+
+
+def test_unknown_measurement(air_temperature):
+    readings = air_temperature([15.0, 200.0]).assign(description='Unknown')
+    assert flag_readings(readings)['qc_flags'].tolist() == [0, 0]
@@ -0,0 +1,115 @@
+import gzip
+import json
+import numpy as np
+import pandas as pd
+import pickle
+import pytest
+from zentra.api import ZentraSettings, ZentraTimeseriesRecord
+from zentra.archive import replay
+from zentra.registry import *
+from zentra.serialize import to_bytes, from_bytes
+
+
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def rename_first_sensor(record):
+    if not COPY_ON_WRITE:
+        # shared data is read-only, and must be copied to be modified
+        with pytest.raises(ValueError):
+            record.sensors.loc[0, 'sensor_name'] = 'CHANGED'
+        record.sensors = record.sensors.copy()
+    record.sensors.loc[0, 'sensor_name'] = 'CHANGED'
+
+
+def shares(first, second):
+    return np.shares_memory(first['port'].to_numpy(), second['port'].to_numpy())
+
+
+@pytest.fixture
+def make_record(make_readings_response):
+    def make(sn="06-00187"):
+        return ZentraTimeseriesRecord(make_readings_response(sn=sn)['device']['timeseries'][0])
+    return make
+
+
+def test_intern():
+    registry = ConfigurationRegistry()
+    first_id, first = registry.intern([{'port': 1, 'sensor_name': 'TEROS 12'}])
+    second_id, second = registry.intern([{'sensor_name': 'TEROS 12', 'port': 1}])
+    assert first_id == second_id and shares(first, second)
+    assert shares(registry.get(first_id), first)
+    assert registry.intern([{'port': 2, 'sensor_name': 'TEROS 12'}])[0] != first_id
+    assert len(registry.clear()) == 0
+
+
+def test_records_share_sensors(make_record):
+    first, second = make_record("06-00187"), make_record("06-00761")
+    assert first.sensors_id == second.sensors_id
+    assert shares(first.sensors, second.sensors)
+    assert shares(from_bytes(to_bytes(first)).sensors, first.sensors)
+    assert shares(pickle.loads(pickle.dumps(first)).sensors, first.sensors)
+
+
+def test_modifying_one_record(make_record):
+    first, second = make_record("06-00187"), make_record("06-00761")
+    rename_first_sensor(first)
+    first.sensors.loc[0, 'port'] = 9
+    assert second.sensors['sensor_name'].tolist() == ['TEROS 12', 'ATMOS 14']
+    assert second.sensors['port'].tolist() == [1, 2]
+    assert CONFIGURATIONS.get(first.sensors_id)['sensor_name'][0] == 'TEROS 12'
+    assert make_record().sensors['port'].tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("load", [lambda record: pickle.loads(pickle.dumps(record)),
+                                  lambda record: from_bytes(to_bytes(record))])
+def test_modified_record_round_trip(make_record, load):
+    record = make_record()
+    rename_first_sensor(record)
+    loaded = load(record)
+    assert loaded.sensors['sensor_name'].tolist() == ['CHANGED', 'ATMOS 14']
+    assert loaded.sensors_id is None
+
+    # a modified record never becomes the shared configuration
+    CONFIGURATIONS.clear()
+    loaded = load(record)
+    assert loaded.sensors['sensor_name'].tolist() == ['CHANGED', 'ATMOS 14']
+    assert record.sensors_id not in CONFIGURATIONS
+    assert make_record().sensors['sensor_name'].tolist() == ['TEROS 12', 'ATMOS 14']
+
+
+def test_register_empty_registry(make_record):
+    record = make_record()
+    CONFIGURATIONS.clear()
+    loaded = pickle.loads(pickle.dumps(record))
+    assert loaded.sensors_id == record.sensors_id in CONFIGURATIONS
+    assert shares(make_record().sensors, loaded.sensors)
+
+
+def test_shared_data_is_read_only(make_record):
+    sensors = CONFIGURATIONS.get(make_record().sensors_id)
+    assert not sensors['port'].to_numpy().flags.writeable
+
+
+def test_settings_share_blocks():
+    def make_settings():
+        settings = ZentraSettings()
+        settings.response = {'device': {'device_info': {'device_sn': "06-00187"},
+                                        'measurement_settings': [{'port': 1, 'measurement_interval': 300}],
+                                        'time_settings': [],
+                                        'locations': [],
+                                        'installation_metadata': [{'sensor_elevations': []}]}}
+        return settings.parse()
+
+    first = make_settings()
+    second = pickle.loads(pickle.dumps(make_settings()))
+    assert shares(first.measurement_settings, second.measurement_settings)
+
+
+def test_replay_shares_sensors(make_readings_response, make_record, tmp_path):
+    for i in range(3):
+        with gzip.open(tmp_path / "{}.json.gz".format(i), 'wt', encoding='utf-8') as f:
+            json.dump(make_readings_response(), f)
+    record = make_record()
+    assert all(shares(readings.timeseries[0].sensors, record.sensors)
+               for readings in replay(tmp_path, workers=2))
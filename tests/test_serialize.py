@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from zentra.api import ZentraReadings, ZentraSettings, ZentraToken
+from zentra.serialize import *
+
+
+@pytest.fixture
+def readings(readings_response):
+    readings = ZentraReadings()
+    readings.response = readings_response
+    return readings.parse()
+
+
+def test_round_trip(readings):
+    loaded = from_bytes(to_bytes(readings))
+    assert loaded.request is None and loaded.response is None
+    assert loaded.device_info == readings.device_info
+    record, loaded_record = readings.timeseries[0], loaded.timeseries[0]
+    assert loaded_record.valid_since == record.valid_since
+    pd.testing.assert_frame_equal(loaded_record.values, record.values)
+    pd.testing.assert_frame_equal(loaded_record.sensors, record.sensors)
+
+
+def test_zero_copy(readings):
+    data = to_bytes(readings)
+    mrids = from_bytes(data).timeseries[0].values['mrid'].to_numpy()
+    assert np.shares_memory(mrids, np.frombuffer(data, dtype='uint8'))
+
+
+def test_include_response(readings):
+    assert from_bytes(to_bytes(readings, include_response=True)).response == readings.response
+
+
+def test_non_string_keys(readings):
+    readings.device_info = {1: 'a', 'sn': {2: 'b'}}
+    assert from_bytes(to_bytes(readings)).device_info == {1: 'a', 'sn': {2: 'b'}}
+
+
+def test_settings_round_trip():
+    settings = ZentraSettings()
+    settings.response = {'device': {'device_info': {'device_sn': "06-00187"},
+                                    'measurement_settings': [{'measurement_interval': 300}],
+                                    'time_settings': [],
+                                    'locations': [{'latitude': 46.9, 'longitude': -114.0}],
+                                    'installation_metadata': [{'sensor_elevations': [{'port': 1, 'elevation': -0.1}]}]}}
+    loaded = from_bytes(to_bytes(settings.parse()))
+    pd.testing.assert_frame_equal(loaded.installation_metadata['sensor_elevations'],
+                                  settings.installation_metadata['sensor_elevations'])
+    assert loaded.time_settings.empty
+
+
+def test_invalid():
+    with pytest.raises(Exception):
+        to_bytes({})
+    with pytest.raises(Exception):
+        from_bytes(b'not serialized')
+    assert from_bytes(to_bytes(ZentraToken(token="token"))).token == "token"
+
+
+def test_mixed_object_column(readings):
+    record = readings.timeseries[0]
+    record.values = record.values.assign(
+        value=np.array([None, True, 1, 1.0, np.nan, 'a', 0.5, 2, False], dtype=object),
+        error=pd.array([True, None, False] * 3, dtype='boolean'),
+        units=np.array(['m', None, np.nan] * 3, dtype=object))
+    values = from_bytes(to_bytes(record)).values
+    pd.testing.assert_frame_equal(values, record.values)
+    assert [type(value) for value in values['value'].iloc[:4]] == [type(None), bool, int, float]
+    assert values['units'].iloc[2] is not None
@@ -0,0 +1,39 @@
+import pandas as pd
+from zentra.api import ZentraStatus
+from zentra.tracker import *
+
+
+def make_status(sn, times, battery_errors, sensor_errors):
+    status = ZentraStatus()
+    status.response = {'device': {'device_info': {'device_sn': sn},
+                                  'device_error_counters': {'battery_errors': battery_errors,
+                                                            'sensor_errors': [{'port': 1, 'errors': sensor_errors}]},
+                                  'cellular_statuses': [{'timestamp_utc': time, 'rssi': -80} for time in times],
+                                  'cellular_error_counters': {'connection_errors': 0}}}
+    return status.parse()
+
+
+def test_tracker_changes(tmp_path):
+    path = str(tmp_path / "statuses.json")
+    tracker = StatusTracker(path)
+    changes = tracker.changes({'06-00187': make_status('06-00187', [100, 200], 1, 0),
+                               '06-00761': make_status('06-00761', [150], 0, 0)})
+    assert len(changes['cellular_statuses']) == 3
+    assert changes['counters'].empty
+    tracker.save()
+
+    tracker = StatusTracker(path)
+    changes = tracker.changes({'06-00187': make_status('06-00187', [200, 300], 2, 2),
+                               '06-00761': make_status('06-00761', [], 0, 0)})
+    assert changes['cellular_statuses']['timestamp_utc'].tolist() == [300]
+    assert changes['counters'][['sn', 'counter', 'previous', 'delta']].values.tolist() == \
+        [['06-00187', 'device.battery_errors', 1, 1], ['06-00187', 'sensor.1.errors', 0, 2]]
+    assert tracker.last_times == {'06-00187': 300, '06-00761': 150}
+
+
+def test_tracker_no_changes():
+    tracker = StatusTracker()
+    tracker.changes({'06-00187': make_status('06-00187', [100], 0, 0)})
+    changes = tracker.changes({'06-00187': make_status('06-00187', [100], 0, 0)})
+    assert changes['cellular_statuses'].empty
+    assert changes['counters'].empty